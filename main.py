@@ -1,10 +1,116 @@
+from __future__ import annotations
+
 import os
-import arxiv
-import pypdf
+import re
+import json
+import mmap
+import time
+import queue
+import shutil
 import argparse
-from datetime import datetime
+import threading
+import uuid
+import multiprocessing
+import subprocess
+from abc import ABC, abstractmethod
+from contextlib import closing, contextmanager
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterator
+from functools import partial
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from colorama import Fore, Back, Style
 
+# arxiv, requests and the PDF libraries pull in large dependency trees, so they are imported where
+# they are used, keeping `python main.py --help` and argument errors fast
+if TYPE_CHECKING:
+    import arxiv
+    import pypdf
+    import requests
+
+# Faster native PDF backends are optional, so fall back to pypdf when they are not installed
+# find_spec checks whether they are installed without paying for the import
+HAS_PYPDFIUM2: bool = find_spec("pypdfium2") is not None
+HAS_PYMUPDF: bool = find_spec("fitz") is not None
+
+# Poppler's pdftotext is a native command-line tool that is used when it is on the PATH
+HAS_PDFTOTEXT: bool = shutil.which("pdftotext") is not None
+
+# Upper bound on concurrent PDF downloads, regardless of what --workers asks for
+# arXiv asks automated clients to be polite, so we never open more than this many connections
+MAX_WORKERS: int = 8
+
+# Map each --sort_by option to the name of the arxiv.SortCriterion member it selects
+# Names are stored instead of members so that building the argument parser does not import arxiv
+SORT_CRITERIA: dict[str, str] = {
+    "relevance": "Relevance",
+    "last_updated_date": "LastUpdatedDate",
+    "submitted_date": "SubmittedDate",
+}
+
+# Maximum time to wait for arXiv to connect or send data while downloading a PDF
+DOWNLOAD_TIMEOUT_SECONDS: int = 60
+
+# Size of each chunk written to disk while downloading a PDF
+DOWNLOAD_CHUNK_BYTES: int = 1024 * 1024
+
+# Name of the file in each query's PDF directory that records how far the query got
+CHECKPOINT_FILENAME: str = "checkpoint.json"
+
+# HTTP statuses arXiv uses to tell clients to slow down
+THROTTLE_STATUSES: frozenset[int] = frozenset({429, 503})
+
+# Cool-off after the first throttled response, doubled for each further throttle in a row
+THROTTLE_COOLDOWN_SECONDS: float = 60
+
+# Longest cool-off between throttled responses
+MAX_THROTTLE_COOLDOWN_SECONDS: float = 300
+
+# Number of throttled responses in a row after which the run stops
+MAX_CONSECUTIVE_THROTTLES: int = 5
+
+# Progress files are rewritten after this many changes, or after SAVE_INTERVAL_SECONDS, whichever comes first
+SAVE_EVERY_CHANGES: int = 50
+SAVE_INTERVAL_SECONDS: float = 5
+
+# JSON file mapping arXiv entry IDs to the local path of each downloaded PDF
+DOWNLOAD_CACHE_PATH: str = "./pdfs/cache.json"
+
+# Characters that are not safe in file names on every platform, such as path separators
+UNSAFE_FILENAME_CHARS: re.Pattern = re.compile(r'[^\w\-. ]')
+
+# PDFs at least this large are memory-mapped instead of read through a buffered file when using pypdf
+MMAP_THRESHOLD_BYTES: int = 50 * 1024 * 1024
+
+# Runs of whitespace within a paragraph, collapsed to a single space when converting to Markdown
+WHITESPACE: re.Pattern = re.compile(r'\s+')
+
+# Maximum time pdftotext may spend on a single PDF before it is treated as failed
+PDFTOTEXT_TIMEOUT_SECONDS: int = 60
+
+# Placeholder paragraph emitted for pages that contain no text, such as full-page figures or scans
+NO_TEXT_PLACEHOLDER: str = "*(no text)*"
+
+# Text extraction backends that can be selected with --pdf_backend
+PDF_BACKENDS: list[str] = ["pymupdf", "pypdfium2", "pdftotext", "pypdf"]
+
+# Prefer the native backends when available since they are much faster than pure-Python pypdf
+# PyMuPDF comes first because its layout analysis also gives us real paragraph boundaries
+if HAS_PYMUPDF:
+    DEFAULT_PDF_BACKEND: str = "pymupdf"
+elif HAS_PYPDFIUM2:
+    DEFAULT_PDF_BACKEND = "pypdfium2"
+elif HAS_PDFTOTEXT:
+    DEFAULT_PDF_BACKEND = "pdftotext"
+else:
+    DEFAULT_PDF_BACKEND = "pypdf"
+
+# ANSI color prefixes for each kind of log message, composed once instead of on every call
+SUCCESS_COLOR: str = f"{Style.BRIGHT}{Fore.BLACK}{Back.GREEN}"
+INFO_COLOR: str = f"{Style.BRIGHT}{Fore.BLACK}{Back.CYAN}"
+WARNING_COLOR: str = f"{Style.BRIGHT}{Fore.BLACK}{Back.YELLOW}"
+ERROR_COLOR: str = f"{Style.BRIGHT}{Fore.WHITE}{Back.RED}"
+RESET_COLOR: str = Style.RESET_ALL
+
 def print_message_with_timestamp(message: str, color: str) -> None:
     """Prints a message with the current date and time in the specified color.
 
@@ -15,11 +121,21 @@ def print_message_with_timestamp(message: str, color: str) -> None:
     Example usage:
         print_message_with_timestamp("This is a test message.", Fore.GREEN)
     """
-    # Get the current date and time in the specified format
-    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # Timestamps only have second resolution, so format each second once and reuse it
+    # The second and its text are stored as one tuple so concurrent threads never see them mismatched
+    now: int = int(time.time())
+    cached_second, current_time = print_message_with_timestamp.cached_timestamp
+    if now != cached_second:
+        # Get the current date and time in the specified format
+        current_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        print_message_with_timestamp.cached_timestamp = (now, current_time)
     # Print the message with the current time and the specified color
     # The color is applied before the message and reset after
-    print(f"{color}{current_time} - {message}{Style.RESET_ALL}")
+    # The newline is part of the string so lines logged by concurrent threads are written in one go
+    print(f"{color}{current_time} - {message}{RESET_COLOR}\n", end="")
+
+# Start with an impossible second so the first message always formats a fresh timestamp
+print_message_with_timestamp.cached_timestamp = (-1, "")
 
 def success(message: str) -> None:
     """Prints a success message with black text and green highlight.
@@ -29,7 +145,7 @@ def success(message: str) -> None:
     """
     # Call the print_message_with_timestamp function to print a success message
     # The message will be displayed in bright black text on a green background
-    print_message_with_timestamp(message, f"{Style.BRIGHT}{Fore.BLACK}{Back.GREEN}")
+    print_message_with_timestamp(message, SUCCESS_COLOR)
 
 def info(message: str) -> None:
     """Prints an info message with black text and cyan highlight.
@@ -39,7 +155,7 @@ def info(message: str) -> None:
     """
     # Call the print_message_with_timestamp function to print an info message
     # The message will be displayed in bright black text on a cyan background
-    print_message_with_timestamp(message, f"{Style.BRIGHT}{Fore.BLACK}{Back.CYAN}")
+    print_message_with_timestamp(message, INFO_COLOR)
 
 def warning(message: str) -> None:
     """Prints a warning message with black text and yellow highlight.
@@ -49,7 +165,7 @@ def warning(message: str) -> None:
     """
     # Call the print_message_with_timestamp function to print a warning message
     # The message will be displayed in bright black text on a yellow background
-    print_message_with_timestamp(message, f"{Style.BRIGHT}{Fore.BLACK}{Back.YELLOW}")
+    print_message_with_timestamp(message, WARNING_COLOR)
 
 def error(message: str) -> None:
     """Prints an error message with bold white text and red highlight.
@@ -59,13 +175,34 @@ def error(message: str) -> None:
     """
     # Call the print_message_with_timestamp function to print an error message
     # The message will be displayed in bright white text on a red background
-    print_message_with_timestamp(message, f"{Style.BRIGHT}{Fore.WHITE}{Back.RED}")
+    print_message_with_timestamp(message, ERROR_COLOR)
+
+def parse_bool(value: str) -> bool:
+    """Parse an explicit boolean option value, as in the older --markdown True form.
+
+    Args:
+        value (str): The value given on the command line, such as "True", "false", "yes" or "0"
+
+    Returns:
+        bool: The parsed value
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a recognised boolean
+
+    Example usage:
+        parse_bool("False")  # False, whereas bool("False") is True
+    """
+    if value.lower() in ("true", "yes", "1"):
+        return True
+    if value.lower() in ("false", "no", "0"):
+        return False
+    raise argparse.ArgumentTypeError(f"expected True or False, got '{value}'")
 
 def parse_args() -> argparse.Namespace:
     """Parses command-line arguments for downloading papers from arXiv.
 
     Example usage:
-        python main.py --query_list "quantum computing" "machine learning" --markdown True --page_size 50 --delay_seconds 5 --num_retries 3 --max_results 20 --sort_by last_updated_date
+        python main.py --query_list "quantum computing" "machine learning" --markdown --page_size 50 --delay_seconds 5 --num_retries 3 --max_results 20 --sort_by last_updated_date
 
     Returns:
         argparse.Namespace: Parsed command-line arguments.
@@ -84,11 +221,30 @@ def parse_args() -> argparse.Namespace:
     )
 
     # Add an argument for converting PDFs to Markdown
+    # type=bool would treat "False" as True, so the value is parsed explicitly and may also be left out
     parser.add_argument(
         "--markdown",
-        type=bool,
-        default=False,
-        help="Convert downloaded PDFs to Markdown format. Default is False."
+        nargs='?',  # Accepts a bare --markdown as well as the older --markdown True/False form
+        const=True,  # A bare --markdown turns conversion on
+        default=False,  # Default is not to convert
+        type=parse_bool,  # Parse "True"/"False" properly
+        metavar="{True,False}",
+        help="Convert downloaded PDFs to Markdown format. Default is False. Example: --markdown"
+    )
+    parser.add_argument(
+        "--no-markdown",
+        dest="markdown",  # Shares the destination of --markdown
+        action="store_false",  # Turns conversion off
+        help="Do not convert downloaded PDFs to Markdown. Example: --no-markdown"
+    )
+    
+    # Add an argument for selecting the PDF text extraction backend
+    parser.add_argument(
+        "--pdf_backend",
+        type=str,  # Expecting a string input
+        choices=PDF_BACKENDS,  # Valid extraction backends
+        default=DEFAULT_PDF_BACKEND,  # Default is the fastest installed backend
+        help=f"Library used to extract text when converting PDFs to Markdown. Default is '{DEFAULT_PDF_BACKEND}'. Example: --pdf_backend pymupdf"
     )
     
     # Add an argument for the number of results to fetch per page
@@ -127,19 +283,269 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--sort_by", 
         type=str,  # Expecting a string input
-        choices=["relevance", "last_updated_date", "submitted_date"],  # Valid options for sorting
+        choices=list(SORT_CRITERIA),  # Valid options for sorting
         default="relevance",  # Default sorting is by relevance
         help="Sort results by specified criteria. Default is 'relevance'. Example: --sort_by last_updated_date"
     )
+
+    # Add an argument for the number of concurrent downloads
+    parser.add_argument(
+        "--workers",
+        type=int,  # Expecting an integer input
+        default=4,  # Default value is 4 concurrent downloads
+        help=f"Number of papers to download concurrently (capped at {MAX_WORKERS}). Default is 4. Example: --workers 2"
+    )
+    
+    # Add an argument for the number of processes used to convert each PDF
+    parser.add_argument(
+        "--md_workers",
+        type=int,  # Expecting an integer input
+        default=os.cpu_count() or 1,  # Default is one process per CPU
+        help="Number of processes used to convert PDFs to Markdown while downloads continue. Default is the number of CPUs. Example: --md_workers 4"
+    )
+    
+    # Add an argument for skipping pages that contain only images
+    parser.add_argument(
+        "--skip_image_pages",
+        action=argparse.BooleanOptionalAction,  # Accepts --skip_image_pages and --no-skip_image_pages
+        default=True,  # Default is to skip image-only pages
+        help="Skip text extraction for pages without fonts, such as scans and full-page figures. Default is True. Example: --no-skip_image_pages"
+    )
     
     # Parse the arguments and return them as a Namespace object
     return parser.parse_args()
 
-def convert_pdf_to_markdown(pdf_path: str) -> str:
+@contextmanager
+def open_pdf_stream(pdf_path: str) -> Iterator[BinaryIO | mmap.mmap]:
+    """Open a PDF for pypdf, memory-mapping it if it is large.
+
+    pypdf seeks around the file a lot (for example to follow the cross-reference table), so large
+    files are memory-mapped to let the kernel page them in on demand instead of buffering reads.
+
+    Args:
+        pdf_path (str): Path to the PDF file to open
+
+    Yields:
+        BinaryIO | mmap.mmap: A seekable binary stream over the PDF
+
+    Example usage:
+        with open_pdf_stream("papers/quantum_computing/paper1.pdf") as pdf_stream:
+            reader = pypdf.PdfReader(pdf_stream)
+    """
+    # Open the PDF file in binary read mode since PDFs are binary files
+    with open(pdf_path, 'rb') as pdf_file:
+        # Small files gain nothing from memory mapping, so use normal buffered reads for them
+        if os.fstat(pdf_file.fileno()).st_size < MMAP_THRESHOLD_BYTES:
+            yield pdf_file
+            return
+
+        pdf_map = mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield pdf_map
+        finally:
+            pdf_map.close()
+
+def pypdf_resources_have_fonts(resources: pypdf.generic.PdfObject | None) -> bool:
+    """Check whether a pypdf resource dictionary, or any form XObject it uses, declares a font.
+
+    Pages without fonts cannot contain extractable text, so they can be skipped without parsing
+    their content stream, which for scanned pages is mostly image data.
+
+    Args:
+        resources (pypdf.generic.PdfObject | None): The /Resources entry of a page or form XObject
+
+    Returns:
+        bool: True if any font is declared, False otherwise
+
+    Example usage:
+        reader = pypdf.PdfReader("papers/quantum_computing/paper1.pdf")
+        has_text = pypdf_resources_have_fonts(reader.pages[0].get("/Resources"))
+    """
+    if resources is None:
+        return False
+    resources = resources.get_object()
+
+    # Fonts used directly by the content stream
+    if resources.get("/Font"):
+        return True
+
+    # Text can also be drawn inside form XObjects, which carry their own resources
+    xobjects = resources.get("/XObject")
+    if xobjects:
+        for xobject in xobjects.get_object().values():
+            xobject = xobject.get_object()
+            if xobject.get("/Subtype") == "/Form" and pypdf_resources_have_fonts(xobject.get("/Resources")):
+                return True
+    return False
+
+def extract_pages_pypdf(pdf_path: str, skip_image_pages: bool = True) -> Iterator[list[str]]:
+    """Yield the paragraphs of each page of a PDF using the pure-Python pypdf library.
+
+    Args:
+        pdf_path (str): Path to the PDF file to read
+        skip_image_pages (bool): Skip pages without fonts instead of parsing them (default: True)
+
+    Yields:
+        list[str]: Raw paragraphs extracted from each page, in page order
+
+    Example usage:
+        for paragraphs in extract_pages_pypdf("papers/quantum_computing/paper1.pdf"):
+            print(paragraphs)
+    """
+    import pypdf
+
+    # Open the PDF as a binary stream, memory-mapped if the file is large
+    with open_pdf_stream(pdf_path) as pdf_stream:
+        # Create PDF reader object using pypdf library
+        # This object provides methods to read and extract content from the PDF
+        pdf_reader: pypdf.PdfReader = pypdf.PdfReader(pdf_stream)
+
+        # Iterate through each page in the PDF
+        for page in pdf_reader.pages:
+
+            # Pages without fonts are images only, so avoid parsing their (often huge) content stream
+            if skip_image_pages and not pypdf_resources_have_fonts(page.get("/Resources")):
+                yield [NO_TEXT_PLACEHOLDER]
+                continue
+
+            # Extract raw text from the current page
+            # This preserves the text content but may lose some formatting
+            text: str = page.extract_text()
+
+            # Split the page text into paragraphs using double newlines
+            # This helps preserve the document's paragraph structure
+            yield text.split('\n\n')
+
+def extract_pages_pypdfium2(pdf_path: str, skip_image_pages: bool = True) -> Iterator[list[str]]:
+    """Yield the paragraphs of each page of a PDF using the native PDFium library.
+
+    Args:
+        pdf_path (str): Path to the PDF file to read
+        skip_image_pages (bool): Emit a placeholder for pages without any text (default: True)
+
+    Yields:
+        list[str]: Raw paragraphs extracted from each page, in page order
+
+    Example usage:
+        for paragraphs in extract_pages_pypdfium2("papers/quantum_computing/paper1.pdf"):
+            print(paragraphs)
+    """
+    import pypdfium2 as pdfium
+
+    # PDFium is a C++ library, so pages and text pages must be closed explicitly to free native memory
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        for page in pdf:
+            # Close the page even if reading its text fails, since only the document is closed below
+            try:
+                textpage = page.get_textpage()
+                try:
+                    # PDFium uses Windows line endings, normalise them so paragraph splitting works
+                    text: str = textpage.get_text_bounded().replace('\r\n', '\n')
+                finally:
+                    textpage.close()
+            finally:
+                page.close()
+
+            # PDFium never decodes images during text extraction, so there is nothing to save by
+            # probing first, but mark empty pages the same way as the other backends
+            if skip_image_pages and not text.strip():
+                yield [NO_TEXT_PLACEHOLDER]
+                continue
+
+            # Split the page text into paragraphs using double newlines
+            yield text.split('\n\n')
+    finally:
+        pdf.close()
+
+def extract_pages_pymupdf(pdf_path: str, skip_image_pages: bool = True) -> Iterator[list[str]]:
+    """Yield the paragraphs of each page of a PDF using the native MuPDF library.
+
+    Unlike the other backends, paragraphs come from MuPDF's layout analysis rather than
+    from splitting the page text on blank lines.
+
+    Args:
+        pdf_path (str): Path to the PDF file to read
+        skip_image_pages (bool): Skip pages without fonts instead of analysing their layout (default: True)
+
+    Yields:
+        list[str]: Raw paragraphs extracted from each page, in page order
+
+    Example usage:
+        for paragraphs in extract_pages_pymupdf("papers/quantum_computing/paper1.pdf"):
+            print(paragraphs)
+    """
+    import fitz
+
+    # Make sure the document is closed even if the caller stops iterating early
+    doc = fitz.open(pdf_path)
+    try:
+        for page in doc:
+            # Pages without fonts are images only, so there is no text to lay out
+            if skip_image_pages and not page.get_fonts():
+                yield [NO_TEXT_PLACEHOLDER]
+                continue
+
+            # Each block is a (x0, y0, x1, y1, text, block_no, block_type) tuple
+            blocks = page.get_text("blocks")
+
+            # Keep text blocks only (block_type 0, images are 1) in MuPDF's reading order
+            yield [block[4] for block in sorted(blocks, key=lambda block: block[5]) if block[6] == 0]
+    finally:
+        doc.close()
+
+def extract_pages_pdftotext(pdf_path: str, skip_image_pages: bool = True) -> Iterator[list[str]]:
+    """Yield the paragraphs of each page of a PDF using Poppler's pdftotext command-line tool.
+
+    Args:
+        pdf_path (str): Path to the PDF file to read
+        skip_image_pages (bool): Emit a placeholder for pages without any text (default: True)
+
+    Yields:
+        list[str]: Raw paragraphs extracted from each page, in page order
+
+    Raises:
+        subprocess.CalledProcessError: If pdftotext fails to read the PDF
+        subprocess.TimeoutExpired: If pdftotext takes longer than PDFTOTEXT_TIMEOUT_SECONDS
+
+    Example usage:
+        for paragraphs in extract_pages_pdftotext("papers/quantum_computing/paper1.pdf"):
+            print(paragraphs)
+    """
+    # Reading order mode (no -layout) keeps two-column papers from being interleaved line by line
+    output: str = subprocess.run(["pdftotext", "-enc", "UTF-8", pdf_path, "-"],
+                                 capture_output=True,
+                                 check=True,
+                                 timeout=PDFTOTEXT_TIMEOUT_SECONDS,
+                                 encoding="utf-8",
+                                 errors="replace").stdout
+
+    # pdftotext ends every page with a form feed, so the final split element is always empty
+    for text in output.split('\f')[:-1]:
+        # Mark empty pages the same way as the other backends
+        if skip_image_pages and not text.strip():
+            yield [NO_TEXT_PLACEHOLDER]
+            continue
+
+        # Split the page text into paragraphs using double newlines
+        yield text.split('\n\n')
+
+# Map each backend name to the function that yields the paragraphs of each page
+PDF_EXTRACTORS: dict[str, Callable[..., Iterator[list[str]]]] = {
+    "pypdf": extract_pages_pypdf,
+    "pypdfium2": extract_pages_pypdfium2,
+    "pymupdf": extract_pages_pymupdf,
+    "pdftotext": extract_pages_pdftotext,
+}
+
+def convert_pdf_to_markdown(pdf_path: str, backend: str = DEFAULT_PDF_BACKEND,
+                            skip_image_pages: bool = True) -> str:
     """Convert a PDF file to markdown text format.
     
     Args:
         pdf_path (str): Path to the PDF file to convert
+        backend (str): Text extraction backend, one of PDF_BACKENDS (default: DEFAULT_PDF_BACKEND)
+        skip_image_pages (bool): Emit a placeholder instead of extracting pages that contain no text (default: True)
         
     Returns:
         str: Markdown formatted text extracted from the PDF
@@ -151,55 +557,54 @@ def convert_pdf_to_markdown(pdf_path: str) -> str:
     Example usage:
         pdf_path = "papers/quantum_computing/paper1.pdf"
         try:
-            markdown_text = convert_pdf_to_markdown(pdf_path)
+            markdown_text = convert_pdf_to_markdown(pdf_path, backend="pypdfium2")
             with open("papers/quantum_computing/paper1.md", "w") as f:
                 f.write(markdown_text)
         except (FileNotFoundError, pypdf.errors.PdfReadError) as e:
             print(f"Error converting PDF: {str(e)}")
     """
+    # Fall back to pypdf if the requested native backend is not installed
+    # pypdf is needed for its error type below even when another backend is used
+    import pypdf
+
+    if ((backend == "pypdfium2" and not HAS_PYPDFIUM2)
+            or (backend == "pymupdf" and not HAS_PYMUPDF)
+            or (backend == "pdftotext" and not HAS_PDFTOTEXT)):
+        warning(f"PDF backend '{backend}' is not installed, falling back to pypdf")
+        backend = "pypdf"
+
     try:
-        # Open the PDF file in binary read mode since PDFs are binary files
-        with open(pdf_path, 'rb') as pdf_file:
-            # Create PDF reader object using pypdf library
-            # This object provides methods to read and extract content from the PDF
-            pdf_reader: pypdf.PdfReader = pypdf.PdfReader(pdf_file)
-            
-            # Initialize empty string to store the final markdown text
-            # We'll build this up page by page
-            markdown_text: str = ""
+        # Native backends report missing files with their own exceptions, so check up front
+        if not os.path.isfile(pdf_path):
+            raise FileNotFoundError(pdf_path)
+
+        # Collect the pieces of the markdown text in a list and join them once at the end
+        # Repeatedly concatenating strings would copy the whole document on every append
+        parts: list[str] = []
+        
+        # Iterate through the paragraphs of each page in the PDF
+        pages: Iterator[list[str]] = PDF_EXTRACTORS[backend](pdf_path, skip_image_pages=skip_image_pages)
+        for page_num, paragraphs in enumerate(pages):
+            # Add a markdown header for each page number
+            # Using level 2 header (##) to allow for document title as level 1
+            parts.append(f"\n## Page {page_num + 1}\n\n")
             
-            # Iterate through each page in the PDF
-            # len(pdf_reader.pages) gives us total number of pages
-            for page_num in range(len(pdf_reader.pages)):
-                # Get the current page object which contains the page's content
-                page: pypdf.PageObject = pdf_reader.pages[page_num]
-                
-                # Extract raw text from the current page
-                # This preserves the text content but may lose some formatting
-                text: str = page.extract_text()
+            # Process each paragraph individually
+            for paragraph in paragraphs:
+                # Clean up the paragraph text:
+                # - collapse every run of whitespace, including line breaks (MuPDF blocks contain them too),
+                #   carriage returns and tabs, into a single space
+                # - strip whitespace from start and end
+                clean_paragraph: str = WHITESPACE.sub(' ', paragraph).strip()
                 
-                # Add a markdown header for each page number
-                # Using level 2 header (##) to allow for document title as level 1
-                markdown_text += f"\n## Page {page_num + 1}\n\n"
-                
-                # Split the page text into paragraphs using double newlines
-                # This helps preserve the document's paragraph structure
-                paragraphs: list[str] = text.split('\n\n')
-                
-                # Process each paragraph individually
-                for paragraph in paragraphs:
-                    # Clean up the paragraph text:
-                    # - replace single newlines with spaces (fixes line breaks)
-                    # - strip whitespace from start and end
-                    clean_paragraph: str = paragraph.replace('\n', ' ').strip()
-                    
-                    # Only add non-empty paragraphs to avoid blank lines
-                    if clean_paragraph:
-                        # Add the cleaned paragraph with double newline for markdown spacing
-                        markdown_text += f"{clean_paragraph}\n\n"
-            
-            # Return the complete markdown text after processing all pages
-            return markdown_text
+                # Only add non-empty paragraphs to avoid blank lines
+                if clean_paragraph:
+                    # Add the cleaned paragraph with double newline for markdown spacing
+                    parts.append(clean_paragraph)
+                    parts.append("\n\n")
+        
+        # Return the complete markdown text after processing all pages
+        return "".join(parts)
             
     except FileNotFoundError:
         # Handle case where the PDF file doesn't exist at the specified path
@@ -212,6 +617,535 @@ def convert_pdf_to_markdown(pdf_path: str) -> str:
         # Re-raise the exception for the caller to handle
         raise
 
+def prefetch_results(client: arxiv.Client, search: arxiv.Search, maxsize: int, breaker: CircuitBreaker,
+                     offset: int = 0) -> Iterator[arxiv.Result]:
+    """Yield search results while a background thread fetches the next pages from arXiv.
+
+    arxiv.Client fetches one page of results at a time and waits delay_seconds between pages,
+    so fetching in the background lets downloads of earlier results overlap with that wait.
+    The background thread holds off during a cool-off, gives up once the breaker aborts, and
+    stops as soon as the generator is closed.
+
+    Args:
+        client (arxiv.Client): The client used to query the arXiv API
+        search (arxiv.Search): The search to run
+        maxsize (int): Maximum number of results buffered ahead of the consumer
+        breaker (CircuitBreaker): Breaker shared with the downloads, checked before each result is fetched
+        offset (int): Number of leading results to skip, used to resume an interrupted query (default: 0)
+
+    Yields:
+        arxiv.Result: Each search result, in the order returned by arXiv
+
+    Raises:
+        Exception: Any error raised while fetching results is re-raised in the consuming thread
+
+    Example usage:
+        client = arxiv.Client()
+        search = arxiv.Search(query="quantum computing")
+        with closing(prefetch_results(client, search, 200, CircuitBreaker())) as results:
+            for result in results:
+                print(result.title)
+    """
+    # Results are handed over through a bounded queue, followed by a sentinel once fetching stops
+    results: queue.Queue = queue.Queue(maxsize=maxsize)
+    done = object()
+    # Set once the consumer stops, so the producer does not keep paging through arXiv for nobody
+    stopped = threading.Event()
+
+    def put(item: object) -> None:
+        # Wait for room in the queue in short steps so a full queue cannot block the producer forever
+        while not stopped.is_set():
+            try:
+                results.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                pass
+
+    def produce() -> None:
+        try:
+            pages: Iterator[arxiv.Result] = client.results(search, offset=offset)
+            # Each next() may fetch a new page, so respect any cool-off before asking for it
+            while not stopped.is_set() and breaker.wait():
+                try:
+                    each_result: arxiv.Result = next(pages)
+                except StopIteration:
+                    break
+                put(each_result)
+        except Exception as e:
+            # Hand the error over so the consumer can raise it instead of waiting forever
+            put(e)
+        put(done)
+
+    # Use a daemon thread so it never keeps the program alive if the consumer stops early
+    threading.Thread(target=produce, daemon=True).start()
+
+    try:
+        while (each_result := results.get()) is not done:
+            if isinstance(each_result, Exception):
+                raise each_result
+            yield each_result
+    finally:
+        # Runs when the consumer breaks out early or the generator is closed
+        stopped.set()
+
+def create_session(workers: int, num_retries: int) -> requests.Session:
+    """Create an HTTP session that reuses connections to arXiv across downloads.
+
+    Args:
+        workers (int): Number of concurrent downloads, used to size the connection pool
+        num_retries (int): Number of times to retry a download after a connection error or a 429/5xx response
+
+    Returns:
+        requests.Session: Session with a retrying connection pool mounted for HTTP and HTTPS
+
+    Example usage:
+        session = create_session(workers=4, num_retries=5)
+        response = session.get("https://arxiv.org/pdf/2101.00001v1", timeout=60)
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    # Back off exponentially on rate limiting and server errors instead of retrying immediately
+    # Return the last response instead of raising once retries run out, so callers can see its status
+    retry = Retry(total=num_retries,
+                  backoff_factor=0.5,
+                  status_forcelist=[429, 500, 502, 503, 504],
+                  raise_on_status=False)
+
+    # Keep one pooled connection per worker so every thread can reuse an open TLS connection
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+class ArxivThrottledError(Exception):
+    """Raised when downloads are abandoned because arXiv kept throttling our requests."""
+
+class CircuitBreaker:
+    """Pause every download when arXiv throttles us, and stop for good if it keeps doing so.
+
+    Each throttled response pauses all workers for a cool-off period that doubles every time,
+    from THROTTLE_COOLDOWN_SECONDS up to MAX_THROTTLE_COOLDOWN_SECONDS. Throttles seen while
+    already paused are ignored, and any successful download resets the count. After
+    max_consecutive_throttles throttles in a row the breaker opens and all downloads stop.
+
+    Example usage:
+        breaker = CircuitBreaker(max_consecutive_throttles=5)
+        if breaker.wait():
+            ...  # Make the request
+            breaker.record_success()
+    """
+
+    def __init__(self, max_consecutive_throttles: int = MAX_CONSECUTIVE_THROTTLES) -> None:
+        """Create a closed circuit breaker.
+
+        Args:
+            max_consecutive_throttles (int): Number of throttles in a row after which downloads stop
+                (default: MAX_CONSECUTIVE_THROTTLES)
+        """
+        self.max_consecutive_throttles: int = max_consecutive_throttles
+        self.consecutive_throttles: int = 0
+        self.aborted: bool = False
+        self._lock = threading.Lock()
+        # Set while requests may be made, cleared during a cool-off
+        self._resumed = threading.Event()
+        self._resumed.set()
+
+    def wait(self) -> bool:
+        """Block until any cool-off has passed.
+
+        Returns:
+            bool: True if requests may continue, False if the breaker has given up
+        """
+        self._resumed.wait()
+        return not self.aborted
+
+    def record_success(self) -> None:
+        """Reset the count of consecutive throttles after a successful request."""
+        with self._lock:
+            self.consecutive_throttles = 0
+
+    def record_throttle(self) -> float | None:
+        """Record a throttled response and pause all requests.
+
+        Returns:
+            float | None: Length of the new cool-off in seconds, or None if requests were already
+            paused or the breaker has just given up
+        """
+        with self._lock:
+            # Requests already in flight when a cool-off started report the same throttle again
+            if self.aborted or not self._resumed.is_set():
+                return None
+
+            self.consecutive_throttles += 1
+            if self.consecutive_throttles >= self.max_consecutive_throttles:
+                # Give up, leaving the event set so waiting workers wake up and see the abort
+                self.aborted = True
+                return None
+
+            cooldown: float = min(THROTTLE_COOLDOWN_SECONDS * 2 ** (self.consecutive_throttles - 1),
+                                  MAX_THROTTLE_COOLDOWN_SECONDS)
+            self._resumed.clear()
+            # Resume from a daemon timer so a pending cool-off never keeps the program alive
+            timer = threading.Timer(cooldown, self._resumed.set)
+            timer.daemon = True
+            timer.start()
+            return cooldown
+
+def sanitize_filename(title: str) -> str:
+    """Turn a paper title into a safe file name without an extension.
+
+    Args:
+        title (str): The paper title from the arXiv API
+
+    Returns:
+        str: The title with whitespace collapsed, unsafe characters (such as slashes) replaced
+        by underscores, and truncated to 200 characters
+
+    Example usage:
+        name = sanitize_filename("Quantum/Classical Hybrid Algorithms")  # "Quantum_Classical Hybrid Algorithms"
+    """
+    # arXiv titles often contain line breaks, so collapse all whitespace to single spaces first
+    return UNSAFE_FILENAME_CHARS.sub('_', ' '.join(title.split())).strip()[:200]
+
+def paper_filename(result: arxiv.Result) -> str:
+    """Build a file name without an extension that is unique to one arXiv paper.
+
+    Sanitised titles are not unique, since different titles can map to the same name and some papers
+    share a title, so the short arXiv ID is appended to tell them apart.
+
+    Args:
+        result (arxiv.Result): The paper result from the arXiv API
+
+    Returns:
+        str: The sanitised title followed by the sanitised short ID in square brackets
+
+    Example usage:
+        name = paper_filename(result)  # "Quantum_Classical Hybrid Algorithms [2101.00001v1]"
+    """
+    # Old-style IDs such as hep-th/9901001v1 contain a slash, so sanitise the ID as well
+    return f"{sanitize_filename(result.title)} [{sanitize_filename(result.get_short_id())}]"
+
+def write_json_atomically(path: str, data: object) -> None:
+    """Write data to a JSON file without ever leaving a half-written file behind.
+
+    Args:
+        path (str): Path to the JSON file
+        data (object): JSON-serialisable data to write
+
+    Example usage:
+        write_json_atomically("./pdfs/cache.json", {"http://arxiv.org/abs/2101.00001v1": "./pdfs/Paper.pdf"})
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write to a temporary file first, then swap it in, so an interrupted run keeps the previous file
+    temp_path: str = f"{path}.tmp"
+    with open(temp_path, "w") as json_file:
+        json.dump(data, json_file)
+    os.replace(temp_path, path)
+
+class BatchedJsonFile(ABC):
+    """Base class for state that is saved to a JSON file in batches rather than on every change.
+
+    Rewriting the whole file after every finished paper would make saving quadratic in the number of
+    papers, so changes are only written once SAVE_EVERY_CHANGES have piled up or SAVE_INTERVAL_SECONDS
+    have passed. Callers must call save() once at the end, and when interrupted, to write the rest.
+    Subclasses provide the data to write by implementing _state().
+
+    Example usage:
+        class Counter(BatchedJsonFile):
+            def _state(self) -> object:
+                return {"count": self.count}
+    """
+
+    def __init__(self, path: str) -> None:
+        """Create the batching state for a JSON file.
+
+        Args:
+            path (str): Path to the JSON file
+        """
+        self.path: str = path
+        self._lock = threading.Lock()
+        self._unsaved_changes: int = 0
+        self._last_saved: float = time.monotonic()
+
+    @abstractmethod
+    def _state(self) -> object:
+        """Return the JSON-serialisable data to write, called while holding the lock."""
+
+    def _changed(self) -> None:
+        """Record a change and save if enough have piled up, called while holding the lock."""
+        self._unsaved_changes += 1
+        if (self._unsaved_changes >= SAVE_EVERY_CHANGES
+                or time.monotonic() - self._last_saved >= SAVE_INTERVAL_SECONDS):
+            self._save()
+
+    def _save(self) -> None:
+        """Write the data to disk, called while holding the lock."""
+        write_json_atomically(self.path, self._state())
+        self._unsaved_changes = 0
+        self._last_saved = time.monotonic()
+
+    def save(self) -> None:
+        """Write any unsaved changes to disk."""
+        with self._lock:
+            if self._unsaved_changes:
+                self._save()
+
+class DownloadCache(BatchedJsonFile):
+    """Map of arXiv entry IDs to the local path of each PDF downloaded by this or an earlier run.
+
+    Example usage:
+        cache = DownloadCache()
+        cache.add("http://arxiv.org/abs/2101.00001v1", "./pdfs/quantum_computing/Paper.pdf")
+        pdf_path = cache.get("http://arxiv.org/abs/2101.00001v1")
+        cache.save()
+    """
+
+    def __init__(self, path: str = DOWNLOAD_CACHE_PATH) -> None:
+        """Load the cache, or start with an empty one if there is no usable cache file.
+
+        Args:
+            path (str): Path to the JSON cache file (default: DOWNLOAD_CACHE_PATH)
+        """
+        super().__init__(path)
+        self._paths: dict[str, str] = {}
+        try:
+            with open(path, "r") as cache_file:
+                self._paths = json.load(cache_file)
+        except FileNotFoundError:
+            # No previous run has written a cache yet
+            pass
+        except json.JSONDecodeError as e:
+            # A corrupted cache only costs us re-downloads, so start afresh instead of failing
+            warning(f"Ignoring unreadable download cache {path}: {e}")
+
+    def _state(self) -> object:
+        return self._paths
+
+    def get(self, entry_id: str) -> str | None:
+        """Return the local path of a previously downloaded paper, or None if it is not cached.
+
+        Args:
+            entry_id (str): arXiv entry ID of the paper
+        """
+        with self._lock:
+            return self._paths.get(entry_id)
+
+    def add(self, entry_id: str, pdf_path: str) -> None:
+        """Remember where a paper was downloaded to.
+
+        Args:
+            entry_id (str): arXiv entry ID of the paper
+            pdf_path (str): Local path of the downloaded PDF
+        """
+        with self._lock:
+            if self._paths.get(entry_id) != pdf_path:
+                self._paths[entry_id] = pdf_path
+                self._changed()
+
+class QueryCheckpoint(BatchedJsonFile):
+    """Progress of one query, saved to disk so an interrupted crawl can resume where it stopped.
+
+    Results complete out of order, so the checkpoint stores both next_offset, the number of leading
+    results that are all done, and done_ids, the entry IDs of every finished result. A resumed run
+    asks arXiv for results starting at next_offset and skips any result in done_ids. Progress is
+    saved in batches, so a result finished just before a crash may be downloaded again.
+
+    Example usage:
+        checkpoint = QueryCheckpoint("./pdfs/quantum_computing/checkpoint.json", "quantum computing", "relevance")
+        for index, result in enumerate(client.results(search, offset=checkpoint.next_offset), checkpoint.next_offset):
+            ...  # Download the result
+            checkpoint.mark_done(index, result.entry_id)
+        checkpoint.remove()
+    """
+
+    def __init__(self, path: str, query: str, sort_by: str) -> None:
+        """Load the checkpoint for a query, or start from scratch if there is none.
+
+        A checkpoint written for a different query or sort order is ignored, since its offset
+        would point into a different list of results.
+
+        Args:
+            path (str): Path to the JSON checkpoint file
+            query (str): The search query the checkpoint belongs to
+            sort_by (str): The --sort_by option used for the query
+        """
+        super().__init__(path)
+        self.query: str = query
+        self.sort_by: str = sort_by
+        self.next_offset: int = 0
+        self.done_ids: set[str] = set()
+        # Number of results that failed in this run, which keeps the checkpoint around for a retry
+        self.failures: int = 0
+        # Indices past next_offset that are already done, waiting for the gap before them to fill
+        self._done_indices: set[int] = set()
+
+        try:
+            with open(path, "r") as checkpoint_file:
+                state: dict = json.load(checkpoint_file)
+        except FileNotFoundError:
+            # No interrupted run to resume
+            return
+        except json.JSONDecodeError as e:
+            warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return
+
+        if state.get("query") == query and state.get("sort_by") == sort_by:
+            self.next_offset = state.get("next_offset", 0)
+            self.done_ids = set(state.get("done", []))
+
+    def mark_done(self, index: int, entry_id: str) -> None:
+        """Record that a result has finished, saving the checkpoint once enough results have.
+
+        Args:
+            index (int): Position of the result in the full list of search results
+            entry_id (str): arXiv entry ID of the result
+        """
+        with self._lock:
+            self.done_ids.add(entry_id)
+            self._done_indices.add(index)
+            # Advance the offset over every leading result that is now done
+            while self.next_offset in self._done_indices:
+                self._done_indices.remove(self.next_offset)
+                self.next_offset += 1
+            self._changed()
+
+    def _state(self) -> object:
+        return {
+            "query": self.query,
+            "sort_by": self.sort_by,
+            "next_offset": self.next_offset,
+            "done": sorted(self.done_ids),
+        }
+
+    def remove(self) -> None:
+        """Delete the checkpoint once the query has finished, so the next run searches afresh."""
+        with self._lock:
+            # Drop any unsaved progress too, so a later save() does not write the file back
+            self._unsaved_changes = 0
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+def convert_and_save(pdf_path: str, md_path: str, backend: str, skip_image_pages: bool) -> None:
+    """Convert a downloaded PDF to Markdown and save it to disk.
+
+    This is a top-level function so that it can be pickled and run in a worker process.
+
+    Args:
+        pdf_path (str): Path to the PDF file to convert
+        md_path (str): Path where the Markdown file will be saved
+        backend (str): Text extraction backend, one of PDF_BACKENDS
+        skip_image_pages (bool): Emit a placeholder instead of extracting pages that contain no text
+
+    Example usage:
+        convert_and_save("./pdfs/quantum_computing/paper1.pdf", "./mds/quantum_computing/paper1.md", "pymupdf", True)
+    """
+    # Convert the downloaded PDF to Markdown
+    markdown_text: str = convert_pdf_to_markdown(pdf_path, backend=backend, skip_image_pages=skip_image_pages)
+
+    # Save the Markdown text to a file
+    with open(md_path, "w") as markdown_file:
+        markdown_file.write(markdown_text)
+
+def download_paper(result: arxiv.Result, pdf_path: str, session: requests.Session,
+                   semaphore: threading.Semaphore, breaker: CircuitBreaker,
+                   cached_path: str | None = None) -> bool:
+    """Download the PDF of a single arXiv result while holding the shared download semaphore.
+
+    Nothing is downloaded if a previous run downloaded the same paper to cached_path, in which
+    case the local copy is reused. A file at pdf_path is only trusted if the cache points to it.
+
+    Args:
+        result (arxiv.Result): The paper result from the arXiv API
+        pdf_path (str): Path where the PDF will be saved
+        session (requests.Session): Session shared by all downloads so connections are reused
+        semaphore (threading.Semaphore): Semaphore bounding the number of concurrent downloads
+        breaker (CircuitBreaker): Circuit breaker that pauses downloads while arXiv is throttling us
+        cached_path (str | None): Path where a previous run saved this paper, if any (default: None)
+
+    Returns:
+        bool: True if the PDF was downloaded, False if an existing copy was reused
+
+    Raises:
+        ValueError: If the result has no PDF link
+        requests.HTTPError: If arXiv responds with an error status after all retries
+        ArxivThrottledError: If downloads were abandoned because arXiv kept throttling us
+
+    Example usage:
+        session = create_session(workers=4, num_retries=5)
+        semaphore = threading.Semaphore(4)
+        breaker = CircuitBreaker()
+        result = next(arxiv.Client().results(arxiv.Search(query="quantum computing")))
+        downloaded = download_paper(result, "./pdfs/quantum_computing/paper1.pdf", session, semaphore, breaker)
+    """
+    # Skip the network entirely if the cache says this paper is already on disk
+    if cached_path and os.path.isfile(cached_path) and os.path.getsize(cached_path) > 0:
+        # The same paper may have been downloaded for another query, so copy it locally instead
+        if cached_path != pdf_path:
+            shutil.copyfile(cached_path, pdf_path)
+        return False
+
+    if not result.pdf_url:
+        raise ValueError(f"No PDF link for {result.entry_id}")
+
+    # Download to a temporary file first so an interrupted download never looks like a finished one
+    # Every download gets its own randomly named file, so concurrent downloads of the same paper never share one
+    temp_path: str = f"{pdf_path}.{uuid.uuid4().hex}.part"
+
+    try:
+        # Wait for a free download slot before opening a connection to arXiv
+        with semaphore:
+            # Hold off while arXiv is throttling us, and give up if the breaker has opened
+            if not breaker.wait():
+                raise ArxivThrottledError(f"Skipped {result.entry_id} after repeated throttling")
+
+            # Reuse the shared session instead of opening a new connection for every paper
+            with session.get(result.pdf_url, stream=True, timeout=DOWNLOAD_TIMEOUT_SECONDS) as response:
+                response.raise_for_status()
+                # Let urllib3 undo any gzip/deflate transfer encoding since we read the raw stream
+                response.raw.decode_content = True
+                # Create the file exclusively so a download can never write into another one's file
+                with open(temp_path, "xb") as pdf_file:
+                    # Copy straight from the socket to disk in large chunks to keep the number of syscalls low
+                    shutil.copyfileobj(response.raw, pdf_file, length=DOWNLOAD_CHUNK_BYTES)
+    except BaseException:
+        # Remove the partial download so it is not left behind next to the real PDFs
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    os.replace(temp_path, pdf_path)
+    return True
+
+def log_conversion(title: str, future: Future) -> bool:
+    """Log the outcome of a Markdown conversion once its future completes.
+
+    Args:
+        title (str): Title of the paper that was converted
+        future (Future): The future returned when the conversion was submitted
+
+    Returns:
+        bool: True if the conversion succeeded, False if it failed
+
+    Example usage:
+        future = convert_pool.submit(convert_and_save, pdf_path, md_path, "pymupdf", True)
+        future.add_done_callback(partial(log_conversion, "Paper title"))
+    """
+    try:
+        # Re-raise any exception that occurred while converting in the worker process
+        future.result()
+        # Log a success message upon successful conversion
+        success(f"Converted {title} to Markdown")
+        return True
+
+    except Exception as e:
+        # Log an error message if the conversion fails
+        error(f"Error converting {title} to Markdown: {e}")
+        return False
+
 def main() -> None:
     """
     Main function to execute the arXiv paper downloader.
@@ -230,10 +1164,18 @@ def main() -> None:
         --max_results: Maximum number of results to return for each query (default: 10).
         --sort_by: Criteria for sorting results (default: "relevance").
         --output_dir: Directory where downloaded papers will be saved (default: "documents").
+        --workers: Number of papers to download concurrently (default: 4).
+        --pdf_backend: Library used to extract text from PDFs (default: fastest installed backend).
+        --md_workers: Number of processes used to convert PDFs to Markdown (default: number of CPUs).
+        --skip_image_pages: Skip text extraction for pages without fonts (default: True).
     """
     # Parse command-line arguments using the parse_args function
     args = parse_args()
 
+    # Only import arxiv and requests once the arguments are known to be valid, since they are slow to import
+    import arxiv
+    import requests
+
     # Create an instance of the arxiv.Client with specified parameters
     # page_size: number of results per page
     # delay_seconds: delay between requests to avoid overwhelming the server
@@ -242,71 +1184,222 @@ def main() -> None:
                           delay_seconds=args.delay_seconds,
                           num_retries=args.num_retries)
     
-    # Check the value of the 'sort_by' argument provided by the user
-    # This determines how the search results will be sorted
-    if args.sort_by == "relevance":
-        # If the user specified "relevance", set the sort criterion to Relevance
-        sort_by = arxiv.SortCriterion.Relevance
-    elif args.sort_by == "last_updated_date":
-        # If the user specified "last_updated_date", set the sort criterion to LastUpdatedDate
-        sort_by = arxiv.SortCriterion.LastUpdatedDate
-    elif args.sort_by == "submitted_date":
-        # If the user specified "submitted_date", set the sort criterion to SubmittedDate
-        sort_by = arxiv.SortCriterion.SubmittedDate
-
-    # Iterate over each query provided in the command-line arguments
-    for each_query in args.query_list:
-        # Create a search object for the current query with specified parameters
-        search = arxiv.Search(
-            query=each_query,  # The search query string
-            max_results=args.max_results,  # Maximum number of results to return
-            sort_by=sort_by,  # Sorting criteria for the results
-        )
-
-        # Log the current search query being processed
-        info(f"Searching for {each_query}")
-
-        # Define the output directory for saving downloaded papers
-        # Replace spaces in the query with underscores for the directory name
-        output_pdf_dir: str = f"./pdfs/{each_query.replace(' ', '_')}/"
-        output_md_dir: str = f"./mds/{each_query.replace(' ', '_')}/"
-        
-        # Create the output directory if it does not exist
-        os.makedirs(output_pdf_dir, exist_ok=True)
-        os.makedirs(output_md_dir, exist_ok=True)
+    # Look up how the search results will be sorted
+    # argparse only accepts keys of SORT_CRITERIA, so this lookup cannot fail
+    sort_by: arxiv.SortCriterion = getattr(arxiv.SortCriterion, SORT_CRITERIA[args.sort_by])
 
-        # Iterate over the results returned by the client for the current search
-        for index, each_result in enumerate(client.results(search)):
-            # Log the progress of downloading results
-            info(f"Downloading {index + 1}/{args.max_results}: {each_result.title}")
+    # Clamp the number of concurrent downloads to a sensible range
+    workers: int = min(max(args.workers, 1), MAX_WORKERS)
+    if workers != args.workers:
+        warning(f"--workers must be between 1 and {MAX_WORKERS}, using {workers}")
 
-            try:
-                # Attempt to download the PDF of the current result to the output directory
-                each_result.download_pdf(dirpath=output_pdf_dir,
-                                         filename=f'{each_result.title}.pdf')
+    # Share a single semaphore across all queries so the global number of downloads stays bounded
+    semaphore = threading.Semaphore(workers)
+
+    # Only keep a small backlog of submitted downloads, so Ctrl-C has little queued work to discard
+    # and results are not pulled from the search faster than they can be downloaded
+    in_flight = threading.BoundedSemaphore(2 * workers)
+
+    # Share a single HTTP session across all queries and threads so connections to arXiv are reused
+    session: requests.Session = create_session(workers, args.num_retries)
+
+    # Load the map of previously downloaded papers so re-runs only fetch new papers
+    cache = DownloadCache()
+
+    # Pause all downloads and searches when arXiv throttles us, so retries are not wasted
+    breaker = CircuitBreaker()
+
+    # Checkpoints of the queries started so far, saved on the way out if the run is interrupted
+    checkpoints: list[QueryCheckpoint] = []
+
+    def handle_throttle(status: int) -> None:
+        cooldown: float | None = breaker.record_throttle()
+        if cooldown is not None:
+            # Slow down searches as well, bounded like the cool-off unless the user asked for a longer delay
+            client.delay_seconds = min(client.delay_seconds * 2,
+                                       max(MAX_THROTTLE_COOLDOWN_SECONDS, args.delay_seconds))
+            warning(f"arXiv responded with HTTP {status}, pausing for {cooldown:.0f}s "
+                    f"and increasing the delay between searches to {client.delay_seconds}s")
+
+    def handle_download(checkpoint: QueryCheckpoint, index: int, each_result: arxiv.Result,
+                        pdf_path: str, md_path: str, future: Future) -> None:
+        # Downloads cancelled by Ctrl-C have nothing to report
+        if future.cancelled():
+            return
+
+        try:
+            # Re-raise any exception that occurred while downloading in the worker thread
+            if future.result():
                 # Log a success message upon successful download
                 success(f"Downloaded {each_result.title}")
+                breaker.record_success()
+                # arXiv is answering normally again, so go back to the requested delay between searches
+                client.delay_seconds = args.delay_seconds
+            else:
+                # Log that an existing copy was reused instead of downloading again
+                info(f"Already downloaded {each_result.title}")
 
-                try:
-                    if args.markdown:
-                        # Convert the downloaded PDF to Markdown
-                        markdown_text = convert_pdf_to_markdown(f"{output_pdf_dir}{each_result.title}.pdf")
-                        
-                        # Save the Markdown text to a file
-                        with open(f"{output_md_dir}{each_result.title}.md", "w") as markdown_file:
-                            markdown_file.write(markdown_text)
-                        
-                        # Log a success message upon successful conversion
-                        success(f"Converted {each_result.title} to Markdown")
-                
-                except Exception as e:
-                    # Log an error message if the conversion fails
-                    error(f"Error converting {each_result.title} to Markdown: {e}")
-
-            except Exception as e:
-                # Log an error message if the download fails
-                error(f"Error downloading {each_result.title}: {e}")
-                pass  # Continue to the next result even if an error occurs
+            # Remember where this paper lives so later runs and queries can skip it
+            cache.add(each_result.entry_id, pdf_path)
+
+        except ArxivThrottledError:
+            # The abort is reported once by the main loop rather than once per skipped paper
+            checkpoint.failures += 1
+            return
+
+        except Exception as e:
+            # Back off for every worker if arXiv is rate limiting or overloaded
+            if isinstance(e, requests.HTTPError) and e.response is not None \
+                    and e.response.status_code in THROTTLE_STATUSES:
+                handle_throttle(e.response.status_code)
+            # Log an error message if the download fails
+            error(f"Error downloading {each_result.title}: {e}")
+            checkpoint.failures += 1
+            return  # Continue with the other results even if an error occurs
+
+        if args.markdown:
+            # Convert in a separate process straight away so the CPU-bound conversion overlaps with the remaining downloads
+            convert_future = convert_pool.submit(convert_and_save,
+                                                 pdf_path,
+                                                 md_path,
+                                                 args.pdf_backend,
+                                                 args.skip_image_pages)
+            convert_future.add_done_callback(partial(handle_conversion, checkpoint, index, each_result))
+        else:
+            # Record the progress of the query so an interrupted run can resume after this result
+            checkpoint.mark_done(index, each_result.entry_id)
+
+    def handle_conversion(checkpoint: QueryCheckpoint, index: int, each_result: arxiv.Result,
+                          future: Future) -> None:
+        # Conversions cancelled by Ctrl-C stay unfinished, so a resumed run converts them
+        if future.cancelled():
+            return
+
+        # A paper only counts as done once its Markdown is written, so a resumed run retries failed conversions
+        if log_conversion(each_result.title, future):
+            checkpoint.mark_done(index, each_result.entry_id)
+        else:
+            checkpoint.failures += 1
+
+    try:
+        # Convert PDFs in a pool of processes shared by all queries, so conversion never holds up downloads
+        # Leaving the with block waits for every conversion to finish
+        # Start workers with spawn rather than fork, forking while download threads hold locks can deadlock the children
+        with ProcessPoolExecutor(max_workers=max(args.md_workers, 1),
+                                 mp_context=multiprocessing.get_context("spawn")) as convert_pool:
+            try:
+                # Iterate over each query provided in the command-line arguments
+                for each_query in args.query_list:
+                    # Wait out any cool-off before searching, and stop once arXiv has throttled us too often
+                    if not breaker.wait():
+                        break
+
+                    # Create a search object for the current query with specified parameters
+                    search = arxiv.Search(
+                        query=each_query,  # The search query string
+                        max_results=args.max_results,  # Maximum number of results to return
+                        sort_by=sort_by,  # Sorting criteria for the results
+                    )
+
+                    # Log the current search query being processed
+                    info(f"Searching for {each_query}")
+
+                    # Define the output directory for saving downloaded papers
+                    # Sanitise the query once and replace spaces with underscores for the directory name
+                    query_dirname: str = sanitize_filename(each_query).replace(' ', '_')
+                    output_pdf_dir: str = os.path.join(".", "pdfs", query_dirname)
+                    output_md_dir: str = os.path.join(".", "mds", query_dirname)
+        
+                    # Create the output directory if it does not exist
+                    os.makedirs(output_pdf_dir, exist_ok=True)
+                    os.makedirs(output_md_dir, exist_ok=True)
+
+                    # Pick up where an interrupted run of this query stopped, if there was one
+                    checkpoint = QueryCheckpoint(os.path.join(output_pdf_dir, CHECKPOINT_FILENAME), each_query, args.sort_by)
+                    checkpoints.append(checkpoint)
+                    if checkpoint.next_offset or checkpoint.done_ids:
+                        info(f"Resuming {each_query} from result {checkpoint.next_offset + 1}")
+
+                    # Download the papers concurrently since the work is dominated by network latency
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        try:
+                            # Submit each result as soon as it arrives, while the next page of results is fetched in the background
+                            # Skip the leading results an interrupted run already finished without asking arXiv for them again
+                            # Close the prefetcher when leaving the loop so its thread stops fetching results
+                            with closing(prefetch_results(client, search, 2 * args.page_size, breaker,
+                                                          checkpoint.next_offset)) as results:
+                                for index, each_result in enumerate(results, checkpoint.next_offset):
+                                    # Stop submitting new downloads once the breaker has given up
+                                    if breaker.aborted:
+                                        break
+
+                                    # Results past the offset may also have finished before the interruption
+                                    if each_result.entry_id in checkpoint.done_ids:
+                                        checkpoint.mark_done(index, each_result.entry_id)
+                                        continue
+
+                                    # Wait for room in the backlog before submitting another download
+                                    in_flight.acquire()
+                                    # Log the progress of downloading results
+                                    info(f"Downloading {index + 1}/{args.max_results}: {each_result.title}")
+                                    # Build both output paths once from the sanitised title and arXiv ID
+                                    filename: str = paper_filename(each_result)
+                                    pdf_path: str = os.path.join(output_pdf_dir, f"{filename}.pdf")
+                                    md_path: str = os.path.join(output_md_dir, f"{filename}.md")
+
+                                    future = executor.submit(download_paper,
+                                                             each_result,
+                                                             pdf_path,
+                                                             session,
+                                                             semaphore,
+                                                             breaker,
+                                                             cache.get(each_result.entry_id))
+
+                                    # Free the backlog slot first so it is released even if handling the download fails
+                                    future.add_done_callback(lambda _: in_flight.release())
+                                    # Handle each download as soon as it finishes, regardless of submission order
+                                    future.add_done_callback(partial(handle_download, checkpoint, index, each_result, pdf_path, md_path))
+
+                            # Wait for the backlog here rather than in the with block, so Ctrl-C while waiting still cancels it
+                            executor.shutdown(wait=True)
+
+                        except arxiv.HTTPError as e:
+                            # Searches are throttled the same way as downloads, anything else is a real failure
+                            if e.status not in THROTTLE_STATUSES:
+                                raise
+                            handle_throttle(e.status)
+                            error(f"Error searching for {each_query}: {e}")
+                            checkpoint.failures += 1
+
+                        except KeyboardInterrupt:
+                            # Drop the queued downloads instead of letting the with block wait for all of them
+                            # Only the few downloads already running are finished before exiting
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            raise
+
+            except KeyboardInterrupt:
+                # Drop the queued conversions as well, so Ctrl-C does not wait for the whole backlog
+                # Wait for the few already running here, since a second shutdown from the with block would not,
+                # and their progress would then finish after the checkpoints had been saved
+                convert_pool.shutdown(wait=True, cancel_futures=True)
+                raise
+
+        # Conversions finish in the background, so a query is only complete once the pool has closed
+        # Its checkpoint is then no longer needed, but keep it if anything failed or the run was cut short
+        # so that a re-run resumes from it
+        for each_checkpoint in checkpoints:
+            if not each_checkpoint.failures and not breaker.aborted:
+                each_checkpoint.remove()
+    finally:
+        # Cache entries and progress are saved in batches, so write the rest on the way out, including on Ctrl-C
+        cache.save()
+        for each_checkpoint in checkpoints:
+            each_checkpoint.save()
+
+    # Downloaded papers are kept, so a later run only needs to fetch what is missing
+    if breaker.aborted:
+        error(f"Stopped after arXiv throttled {breaker.max_consecutive_throttles} times in a row, "
+              "re-run later to download the remaining papers")
 
 # This block checks if the script is being run as the main program.
 # The __name__ variable is set to "__main__" when the script is executed directly,